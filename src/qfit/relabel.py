@@ -5,7 +5,7 @@ import itertools as itl
 import copy
 import tqdm
 import logging
-from .vdw_radii import vdwRadiiTable, EpsilonTable, EpsilonIndex, EpsilonArray
+from .vdw_radii import vdwRadiiTable, epsilon_arrays, epsilon_indices
 from .structure import Structure
 
 
@@ -95,13 +95,9 @@ class Relabeller:
             return 0.0
 
         # epsilon
-        atom1_epsilon_index = np.array([EpsilonIndex.index(e) for e in node1.e])[
-            :, np.newaxis
-        ]
-        atom2_epsilon_index = np.array([EpsilonIndex.index(e) for e in node2.e])[
-            np.newaxis, :
-        ]
-        epsilon_ij = np.array(EpsilonArray)[atom1_epsilon_index, atom2_epsilon_index]
+        atom1_epsilon_index = epsilon_indices(node1.e)[:, np.newaxis]
+        atom2_epsilon_index = epsilon_indices(node2.e)[np.newaxis, :]
+        epsilon_ij = epsilon_arrays(atom1_epsilon_index, atom2_epsilon_index)
 
         # radii
         atom1_radius = np.array([vdwRadiiTable[e] for e in node1.e])[:, np.newaxis]
@@ -1,9 +1,21 @@
+import functools
 import os.path
 
 import numpy as np
-import copy
 
-from .structure.math import Rz, Ry, gram_schmidt_orthonormal_zx
+from .structure.math import Rz, gram_schmidt_orthonormal_zx
+
+
+@functools.lru_cache(maxsize=1024)
+def _Rz_degrees(angle):
+    """Cached, read-only Rz for an angle in degrees.
+
+    The angle rotators are rebuilt for every conformer but are driven over
+    the same angle grid, so the rotation about z is shared between them.
+    """
+    R = Rz(np.deg2rad(angle))
+    R.flags.writeable = False
+    return R
 
 
 class BackboneRotator:
@@ -16,7 +28,7 @@ class BackboneRotator:
         self._starting_coor = segment.coor
 
         # Check for each rotation which atoms are affected. Start with the last residue.
-        self._aligners = []
+        axes = []
         self._origins = []
         selections = []
         for n, residue in enumerate(self.segment.residues[::-1]):
@@ -31,23 +43,23 @@ class BackboneRotator:
             N = residue.extract("name", "N")
             CA = residue.extract("name", "CA")
             C = residue.extract("name", "C")
-            axis = C.coor[0] - CA.coor[0]
-            psi_aligner = ZAxisAligner(axis)
-            axis = CA.coor[0] - N.coor[0]
-            phi_aligner = ZAxisAligner(axis)
-
-            self._aligners += [psi_aligner, phi_aligner]
+            axes += [C.coor[0] - CA.coor[0], CA.coor[0] - N.coor[0]]
             self._origins += [C.coor[0], CA.coor[0]]
 
+        # Each rotation moves its own selection plus every atom moved by the
+        # rotations before it; accumulate the union in a mask.
+        mask = np.zeros(self.segment._coor.shape[0], dtype=bool)
         self._atoms_to_rotate = []
         for selection in selections:
-            atoms_to_rotate = []
-            if self._atoms_to_rotate:
-                atoms_to_rotate = np.concatenate((self._atoms_to_rotate))
-            atoms_to_rotate = np.concatenate((atoms_to_rotate, selection)).astype(
-                np.int32
-            )
-            self._atoms_to_rotate.append(np.unique(atoms_to_rotate))
+            mask[selection] = True
+            self._atoms_to_rotate.append(np.flatnonzero(mask).astype(np.int32))
+
+        # Align all psi and phi axes at once; the stacked rotations let all
+        # torsion rotations be formed in one go.
+        self._forward_stack, self._backward_stack = _zaxis_align_batch(axes)
+        self._origins_arr = np.asarray(self._origins)
+        natoms_max = max((sel.shape[0] for sel in self._atoms_to_rotate), default=0)
+        self._scratch = np.empty((2, natoms_max, 3))
 
     def __call__(self, torsions):
         assert len(torsions) == self.ndofs, "Number of torsions should equal "
@@ -56,27 +68,53 @@ class BackboneRotator:
         # We start with the last torsion as this is more efficient
         torsions = np.deg2rad(torsions[::-1])
 
+        # Build the rotation about z for every torsion at once and combine it
+        # with the alignment rotations.
+        cos_t = np.cos(torsions)
+        sin_t = np.sin(torsions)
+        Rz_stack = np.zeros((self.ndofs, 3, 3))
+        Rz_stack[:, 0, 0] = cos_t
+        Rz_stack[:, 0, 1] = -sin_t
+        Rz_stack[:, 1, 0] = sin_t
+        Rz_stack[:, 1, 1] = cos_t
+        Rz_stack[:, 2, 2] = 1
+        R_all = self._forward_stack @ Rz_stack @ self._backward_stack
+
         self.segment.coor = self._starting_coor
-        atoms_to_rotate = []
-        iterator = zip(torsions, self._origins, self._aligners, self._atoms_to_rotate)
-        for torsion, origin, aligner, atoms_to_rotate in iterator:
+        xyz = self.segment._coor
+        iterator = zip(torsions, self._origins_arr, R_all, self._atoms_to_rotate)
+        for torsion, origin, R, atoms_to_rotate in iterator:
             if torsion == 0.0:
                 continue
-            coor = self.segment._coor[atoms_to_rotate]
+            # Gather into and rotate between the scratch buffers, leaving a
+            # single scatter back into the segment coordinates. The indices
+            # are known to be in range; mode="clip" lets np.take write into
+            # coor directly, where the default mode buffers out.
+            natoms = atoms_to_rotate.shape[0]
+            coor = self._scratch[0, :natoms]
+            rotated = self._scratch[1, :natoms]
+            np.take(xyz, atoms_to_rotate, axis=0, out=coor, mode="clip")
             coor -= origin
-            R = aligner.forward_rotation @ Rz(torsion) @ aligner.backward_rotation
-            coor = np.dot(coor, R.T)
-            coor += origin
-            self.segment._coor[atoms_to_rotate] = coor
+            np.dot(coor, R.T, rotated)
+            rotated += origin
+            xyz[atoms_to_rotate] = rotated
 
 
 class Translator:
-    def __init__(self, ligand):
+
+    """Translate a ligand.
+
+    Translator and GlobalRotator compute the moved coordinates in dtype;
+    float32 halves the memory traffic when the precision is not needed.
+    """
+
+    def __init__(self, ligand, dtype=np.float64):
         self.ligand = ligand
-        self.coor_to_translate = self.ligand.coor
+        self._dtype = dtype
+        self.coor_to_translate = self.ligand.coor.astype(dtype, copy=False)
 
     def __call__(self, trans):
-        self.ligand.coor = self.coor_to_translate + np.asarray(trans)
+        self.ligand.coor = self.coor_to_translate + np.asarray(trans, self._dtype)
 
 
 class CBAngleRotator:
@@ -119,6 +157,7 @@ class CBAngleRotator:
         aligner = ZAxisAligner(axis)
         self._forward = aligner.forward_rotation
         self._coor_to_rotate = (aligner.backward_rotation @ self._coor_to_rotate.T).T
+        self._tmp = np.empty(self._coor_to_rotate.shape)
 
     def __call__(self, angle):
         """Flex CA-CB-CG by specified angle.
@@ -129,10 +168,10 @@ class CBAngleRotator:
         # Since the axis of rotation is already aligned with the z-axis, we can
         # freely rotate the coordinates and perform the inverse operation to realign the
         # axis to the real world frame.
-        R = self._forward @ Rz(np.deg2rad(angle))
-        self.residue._coor[self.atoms_to_rotate] = (
-            R @ self._coor_to_rotate.T
-        ).T + self._origin
+        R = self._forward @ _Rz_degrees(angle)
+        np.dot(self._coor_to_rotate, R.T, self._tmp)
+        self._tmp += self._origin
+        self.residue._coor[self.atoms_to_rotate] = self._tmp
 
 
 class BisectingAngleRotator:
@@ -187,32 +226,35 @@ class BisectingAngleRotator:
         aligner = ZAxisAligner(new_axis)
         self._forward = aligner.forward_rotation
         self._coor_to_rotate = (aligner.backward_rotation @ self._coor_to_rotate.T).T
+        self._tmp = np.empty(self._coor_to_rotate.shape)
 
     def __call__(self, angle):
         # Since the axis of rotation is already aligned with the z-axis, we can
         # freely rotate the coordinates and perform the inverse operation to realign the
         # axis to the real world frame.
-        R = self._forward @ Rz(np.deg2rad(angle))
-        self.residue._coor[self.atoms_to_rotate] = (
-            R @ self._coor_to_rotate.T
-        ).T + self._origin
+        R = self._forward @ _Rz_degrees(angle)
+        np.dot(self._coor_to_rotate, R.T, self._tmp)
+        self._tmp += self._origin
+        self.residue._coor[self.atoms_to_rotate] = self._tmp
 
 
 class GlobalRotator:
 
-    """Rotate ligand around its center."""
+    """Rotate ligand around its center, in dtype as for Translator."""
 
-    def __init__(self, ligand, center=None):
+    def __init__(self, ligand, center=None, dtype=np.float64):
         self.ligand = ligand
         self._center = center
         ligand_coor = self.ligand.coor
         if self._center is None:
             self._center = ligand_coor.mean(axis=0)
-        self._coor_to_rotate = ligand_coor - self._center
-        self._intermediate = np.zeros_like(ligand_coor)
+        self._center = np.asarray(self._center, dtype)
+        self._coor_to_rotate = (ligand_coor - self._center).astype(dtype, copy=False)
+        self._intermediate = np.zeros_like(self._coor_to_rotate)
 
     def __call__(self, rotmat):
-        self._intermediate = np.dot(rotmat, self._coor_to_rotate.T).T
+        rotmat = np.asarray(rotmat, self._intermediate.dtype)
+        np.dot(self._coor_to_rotate, rotmat.T, self._intermediate)
         self._intermediate += self._center
         self.ligand.coor = self._intermediate
 
@@ -232,11 +274,62 @@ class PrincipalAxisRotator:
         self.principal_axes = np.asarray(eig_vectors[:, sort_ind].T)
 
         self.aligners = [ZAxisAligner(axis) for axis in self.principal_axes]
+        self._tmp = np.empty(self._coor_to_rotate.shape)
 
     def __call__(self, angle, axis=2):
         aligner = self.aligners[axis]
         R = aligner.forward_rotation @ Rz(angle) @ aligner.backward_rotation
-        self.ligand.coor[:] = (R @ self._coor_to_rotate.T).T + self._center
+        np.dot(self._coor_to_rotate, R.T, self._tmp)
+        self._tmp += self._center
+        self.ligand.coor[:] = self._tmp
+
+
+def _dense_to_csr(conn):
+    """Convert a dense (n, n) connectivity matrix to CSR form.
+
+    Returns:
+        tuple(np.ndarray[int], np.ndarray[int]): indptr and indices; the
+            neighbours of atom i are indices[indptr[i]:indptr[i + 1]].
+    """
+    conn = np.asarray(conn)
+    rows, indices = np.nonzero(conn)
+    indptr = np.zeros(conn.shape[0] + 1, dtype=np.intp)
+    np.cumsum(np.bincount(rows, minlength=conn.shape[0]), out=indptr[1:])
+    return indptr, indices
+
+
+def _find_neighbours(conn, root, curr):
+    """Find the atoms reached from curr without passing through root.
+
+    The connectivity is converted to CSR once and walked depth-first with an
+    explicit stack and a visited mask, so long chains do not hit the
+    recursion limit.
+
+    Returns:
+        tuple(np.ndarray[int], int): The atom indices in visiting order,
+            starting with root and curr, and the number of times a bond
+            back to root was seen. A count above 1 means root and curr are
+            part of a ring.
+    """
+    indptr, indices = _dense_to_csr(conn)
+    visited = np.zeros(indptr.shape[0] - 1, dtype=bool)
+    visited[root] = True
+    visited[curr] = True
+    order = [root, curr]
+    foundroot = 0
+    stack = [iter(indices[indptr[curr] : indptr[curr + 1]])]
+    while stack:
+        for b in stack[-1]:
+            if b == root:
+                foundroot += 1
+            if not visited[b]:
+                visited[b] = True
+                order.append(b)
+                stack.append(iter(indices[indptr[b] : indptr[b + 1]]))
+                break
+        else:
+            stack.pop()
+    return np.array(order, dtype=np.int32), foundroot
 
 
 # TODO Make a super class combining the BondRotator with the AngleRotator or at
@@ -255,10 +348,10 @@ class BondAngleRotator:
         # Determine which atoms will be moved by the rotation.
         self._root = getattr(ligand, key).tolist().index(a2)
         self._conn = ligand.connectivity
-        self.atoms_to_rotate = [self._root]
-        self._foundroot = 0
         curr = getattr(ligand, key).tolist().index(a3)
-        self._find_neighbours_recursively(curr)
+        self.atoms_to_rotate, self._foundroot = _find_neighbours(
+            self._conn, self._root, curr
+        )
         if self._foundroot > 1:
             raise ValueError("Atoms are part of a ring. Bond angle cannot be rotated.")
 
@@ -275,24 +368,16 @@ class BondAngleRotator:
         aligner = ZAxisAligner(axis)
         self._forward = aligner.forward_rotation
         self._coor_to_rotate = (aligner.backward_rotation @ self._coor_to_rotate.T).T
-
-    def _find_neighbours_recursively(self, curr):
-        self.atoms_to_rotate.append(curr)
-        bonds = np.flatnonzero(self._conn[curr])
-        for b in bonds:
-            if b == self._root:
-                self._foundroot += 1
-            if b not in self.atoms_to_rotate:
-                self._find_neighbours_recursively(b)
+        self._tmp = np.empty(self._coor_to_rotate.shape)
 
     def __call__(self, angle):
         # Since the axis of rotation is already aligned with the z-axis, we can
         # freely rotate the coordinates and perform the inverse operation to realign the
         # axis to the real world frame.
         R = self._forward @ Rz(angle)
-        self.ligand.coor[self.atoms_to_rotate] = (
-            R @ self._coor_to_rotate.T
-        ).T + self._t
+        np.dot(self._coor_to_rotate, R.T, self._tmp)
+        self._tmp += self._t
+        self.ligand.coor[self.atoms_to_rotate] = self._tmp
 
 
 class ChiRotator:
@@ -340,7 +425,7 @@ class ChiRotator:
         self._tmp = np.zeros_like(self._coor_to_rotate)
 
     def __call__(self, angle):
-        R = self._forward @ Rz(np.deg2rad(angle))
+        R = self._forward @ _Rz_degrees(angle)
         np.dot(self._coor_to_rotate, R.T, self._tmp)
         self._tmp += self._origin
         self.residue._coor[self._atom_selection] = self._tmp
@@ -374,15 +459,17 @@ class CovalentBondRotator:
         # Align the rotation axis to the z-axis for the coordinates
         self._forward = aligner.forward_rotation
         self._coor_to_rotate = (aligner.backward_rotation @ self._coor_to_rotate.T).T
+        self._tmp = np.empty(self._coor_to_rotate.shape)
 
     def __call__(self, angle):
         # Since the axis of rotation is already aligned with the z-axis, we can
         # freely rotate them and perform the inverse operation to realign the
         # axis to the real world frame.
         R = self._forward @ Rz(angle)
-        rotated = (R @ self._coor_to_rotate.T).T + self._t
-        coor = copy.deepcopy(self.ligand.coor)
-        coor[self.atoms_to_rotate] = rotated
+        np.dot(self._coor_to_rotate, R.T, self._tmp)
+        self._tmp += self._t
+        coor = self.ligand.coor.copy()
+        coor[self.atoms_to_rotate] = self._tmp
         return coor
 
 
@@ -399,10 +486,10 @@ class BondRotator:
         # Determine which atoms will be moved by the rotation.
         self._root = getattr(ligand, key).tolist().index(a1)
         self._conn = ligand.connectivity
-        self.atoms_to_rotate = [self._root]
-        self._foundroot = 0
         curr = getattr(ligand, key).tolist().index(a2)
-        self._find_neighbours_recursively(curr)
+        self.atoms_to_rotate, self._foundroot = _find_neighbours(
+            self._conn, self._root, curr
+        )
         # if self._foundroot > 1:
         #    raise ValueError("Atoms are part of a ring. Bond cannot be rotated.")
 
@@ -418,15 +505,7 @@ class BondRotator:
         # Align the rotation axis to the z-axis for the coordinates
         self._forward = aligner.forward_rotation
         self._coor_to_rotate = (aligner.backward_rotation @ self._coor_to_rotate.T).T
-
-    def _find_neighbours_recursively(self, curr):
-        self.atoms_to_rotate.append(curr)
-        bonds = np.flatnonzero(self._conn[curr])
-        for b in bonds:
-            if b == self._root:
-                self._foundroot += 1
-            if b not in self.atoms_to_rotate:
-                self._find_neighbours_recursively(b)
+        self._tmp = np.empty(self._coor_to_rotate.shape)
 
     def __call__(self, angle):
         # print(self.ligand.coor)
@@ -434,40 +513,89 @@ class BondRotator:
         # freely rotate them and perform the inverse operation to realign the
         # axis to the real world frame.
         R = self._forward @ Rz(angle)
-        rotated = (R @ self._coor_to_rotate.T).T + self._t
-        coor = copy.deepcopy(self.ligand.coor)
-        coor[self.atoms_to_rotate] = rotated
+        np.dot(self._coor_to_rotate, R.T, self._tmp)
+        self._tmp += self._t
+        coor = self.ligand.coor.copy()
+        coor[self.atoms_to_rotate] = self._tmp
         return coor
 
 
+def _zaxis_align(axis):
+    """Return the forward and backward rotations aligning axis to the Z-axis.
+
+    The rotations are Rz @ Ry and its transpose; see _zaxis_align_batch.
+    """
+    forward, backward = _zaxis_align_batch(axis)
+    return forward[0], backward[0]
+
+
+def _zaxis_align_batch(axes):
+    """Return the rotations aligning each of an (n, 3) array of axes to the
+    Z-axis.
+
+    Returns:
+        tuple(np.ndarray[float], np.ndarray[float]): The (n, 3, 3) forward
+            and backward rotations.
+    """
+    axes = np.asarray(axes, dtype=np.float64).reshape(-1, 3)
+
+    # Find angle between rotation axis and x-axis
+    norm_xy = np.hypot(axes[:, 0], axes[:, 1])
+    if np.any(norm_xy == 0):
+        raise ValueError(f"Axis {axes[norm_xy == 0][0]} is not aligned to z-axis.")
+    x, y, z = (axes / norm_xy[:, np.newaxis]).T
+    xaxis_angle = np.arccos(np.clip(x, -1.0, 1.0))
+    xaxis_angle[y < 0] *= -1
+
+    # Rotate around Z-axis
+    cos_z = np.cos(xaxis_angle)
+    sin_z = np.sin(xaxis_angle)
+    x, y = cos_z * x + sin_z * y, cos_z * y - sin_z * x
+
+    # Find angle between rotation axis and z-axis
+    norm = np.sqrt(x * x + y * y + z * z)
+    zaxis_angle = np.arccos(np.clip(z / norm, -1.0, 1.0))
+    zaxis_angle[x < 0] *= -1
+    cos_y = np.cos(zaxis_angle)
+    sin_y = np.sin(zaxis_angle)
+
+    # Check whether the transformation is correct.
+    # Rotate around the Y-axis to align to the Z-axis.
+    x, z = (cos_y * x - sin_y * z) / norm, (sin_y * x + cos_y * z) / norm
+    y = y / norm
+    aligned = (np.abs(x) <= 1e-8) & (np.abs(y) <= 1e-8) & (np.abs(z - 1) <= 1e-8 + 1e-5)
+    if not np.all(aligned):
+        n = np.flatnonzero(~aligned)[0]
+        raise ValueError(
+            f"Axis {np.array([x[n], y[n], z[n]])} is not aligned to z-axis."
+        )
+
+    forward = np.empty((axes.shape[0], 3, 3))
+    forward[:, 0, 0] = cos_z * cos_y
+    forward[:, 0, 1] = -sin_z
+    forward[:, 0, 2] = cos_z * sin_y
+    forward[:, 1, 0] = sin_z * cos_y
+    forward[:, 1, 1] = cos_z
+    forward[:, 1, 2] = sin_z * sin_y
+    forward[:, 2, 0] = -sin_y
+    forward[:, 2, 1] = 0.0
+    forward[:, 2, 2] = cos_y
+    return forward, forward.transpose(0, 2, 1).copy()
+
+
 class ZAxisAligner:
     """Find the rotation that aligns a vector to the Z-axis."""
 
     def __init__(self, axis):
-        # Find angle between rotation axis and x-axis
-        axis = axis / np.linalg.norm(axis[:-1])
-        xaxis_angle = np.arccos(axis[0])
-        if axis[1] < 0:
-            xaxis_angle *= -1
-
-        # Rotate around Z-axis
-        self._Rz = Rz(xaxis_angle)
-        axis = np.dot(self._Rz.T, axis.reshape(3, -1)).ravel()
-
-        # Find angle between rotation axis and z-axis
-        zaxis_angle = np.arccos(axis[2] / np.linalg.norm(axis))
-        if axis[0] < 0:
-            zaxis_angle *= -1
-        self._Ry = Ry(zaxis_angle)
+        self.forward_rotation, self.backward_rotation = _zaxis_align(axis)
 
-        # Check whether the transformation is correct.
-        # Rotate around the Y-axis to align to the Z-axis.
-        axis = np.dot(self._Ry.T, axis.reshape(3, -1)).ravel() / np.linalg.norm(axis)
-        if not np.allclose(axis, [0, 0, 1]):
-            raise ValueError(f"Axis {axis} is not aligned to z-axis.")
 
-        self.backward_rotation = self._Ry.T @ self._Rz.T
-        self.forward_rotation = self._Rz @ self._Ry
+@functools.lru_cache(maxsize=16)
+def _load_local_set(cls, fname):
+    quats = np.load(os.path.join(cls._DATA_DIRECTORY, fname))
+    rotmats = cls.quats_to_rotmats(quats)
+    rotmats.flags.writeable = False
+    return rotmats
 
 
 class RotationSets:
@@ -482,6 +610,10 @@ class RotationSets:
 
     _DATA_DIRECTORY = os.path.join(os.path.dirname(__file__), "data")
 
+    # Largest number of candidate rotations drawn at a time when sampling
+    # local sets
+    _BATCH_SIZE = 1 << 16
+
     @classmethod
     def get_set(cls, angle):
         angles = zip(*cls.SETS)[-1]
@@ -493,28 +625,48 @@ class RotationSets:
 
     @classmethod
     def get_local_set(cls, fname="local_10_10.npy"):
-        quats = np.load(os.path.join(cls._DATA_DIRECTORY, fname))
-        return cls.quats_to_rotmats(quats)
+        """Return the rotation matrices of a local rotation set.
+
+        The set is loaded once per process and shared, so the returned
+        array is read-only.
+        """
+        return _load_local_set(cls, fname)
 
     @classmethod
     def local(cls, max_angle, nrots=100):
         quats = []
+        nquats = 0
         radian_max_angle = np.deg2rad(max_angle)
-        while len(quats) < nrots - 1:
-            quat = cls.random_rotation()
-            angle = 2 * np.arccos(quat[0])
-            if angle <= radian_max_angle:
-                quats.append(quat)
-        quats.append(np.asarray([1, 0, 0, 0], dtype=np.float64))
-        return np.asarray(quats)
+
+        # Fraction of uniform rotations with 2 * arccos(w) <= max_angle
+        theta = min(radian_max_angle, 2 * np.pi)
+        acceptance = max((theta - np.sin(theta)) / (2 * np.pi), 1e-12)
+
+        while nquats < nrots - 1:
+            # Draw candidates in blocks sized from the number still needed
+            # and keep those within max_angle
+            nneeded = nrots - 1 - nquats
+            nbatch = min(int(2 * nneeded / acceptance) + 16, cls._BATCH_SIZE)
+            batch = cls.random_rotations(nbatch)
+            angles = 2 * np.arccos(np.clip(batch[:, 0], -1, 1))
+            batch = batch[angles <= radian_max_angle][: nrots - 1 - nquats]
+            quats.append(batch)
+            nquats += batch.shape[0]
+        quats.append(np.asarray([[1, 0, 0, 0]], dtype=np.float64))
+        return np.concatenate(quats)
 
     @staticmethod
-    def quats_to_rotmats(quaternions):
+    def quats_to_rotmats(quaternions, assume_unit=False, decimals=8, dtype=np.float64):
         """Converts an array of quaternions to rotation matrices.
 
         Args:
             quaternions (np.ndarray[np.float]):
                 A (n, 4) array of rotations, expressed as quaternions.
+            assume_unit (bool): Skip normalizing the quaternions, which must
+                then already be unit quaternions.
+            decimals (Optional[int]): Round the rotation matrices to this
+                many decimal places; None to skip rounding.
+            dtype (np.dtype): Data type of the returned rotation matrices.
 
         Returns:
             np.ndarray[np.float]:
@@ -524,31 +676,35 @@ class RotationSets:
         # Unpack quaternions into columns of coefficients
         (w, x, y, z) = quaternions.T
 
-        # Calculate the magnitude of the quats
-        Nq = w**2 + x**2 + y**2 + z**2
+        # Calculate scaled X, Y, Z, using the magnitude of the quats to make
+        # unit quats
+        if assume_unit:
+            X, Y, Z = x * 2, y * 2, z * 2
+        else:
+            s = 2.0 / (w**2 + x**2 + y**2 + z**2)
+            X, Y, Z = x * s, y * s, z * s
 
-        # Determine values of scalars required to make unit quats
-        s = 1.0 / Nq
-
-        # Calculate scaled X, Y, Z
-        X, Y, Z = x * s * 2, y * s * 2, z * s * 2
+        xX, yY, zZ = x * X, y * Y, z * Z
+        xY, xZ, yZ = x * Y, x * Z, y * Z
+        wX, wY, wZ = w * X, w * Y, w * Z
 
         # Fill rotmats array
-        rotmats = np.empty((quaternions.shape[0], 3, 3), dtype=np.float64)
-        rotmats[:, 0, 0] = 1.0 - (y * Y + z * Z)
-        rotmats[:, 0, 1] = x * Y - w * Z
-        rotmats[:, 0, 2] = x * Z + w * Y
+        rotmats = np.empty((quaternions.shape[0], 3, 3), dtype=dtype)
+        rotmats[:, 0, 0] = 1.0 - (yY + zZ)
+        rotmats[:, 0, 1] = xY - wZ
+        rotmats[:, 0, 2] = xZ + wY
 
-        rotmats[:, 1, 0] = x * Y + w * Z
-        rotmats[:, 1, 1] = 1.0 - (x * X + z * Z)
-        rotmats[:, 1, 2] = y * Z - w * X
+        rotmats[:, 1, 0] = xY + wZ
+        rotmats[:, 1, 1] = 1.0 - (xX + zZ)
+        rotmats[:, 1, 2] = yZ - wX
 
-        rotmats[:, 2, 0] = x * Z - w * Y
-        rotmats[:, 2, 1] = y * Z + w * X
-        rotmats[:, 2, 2] = 1.0 - (x * X + y * Y)
+        rotmats[:, 2, 0] = xZ - wY
+        rotmats[:, 2, 1] = yZ + wX
+        rotmats[:, 2, 2] = 1.0 - (xX + yY)
 
-        # In place round to 8dp
-        rotmats.round(decimals=8, out=rotmats)
+        # In place round, 8dp by default
+        if decimals is not None:
+            rotmats.round(decimals=decimals, out=rotmats)
 
         return rotmats
 
@@ -566,20 +722,40 @@ class RotationSets:
                 Ann Math Stat 1972, 43:645–646.
                 doi:10.1214/aoms/1177692644
         """
-        # Choose e1, e2 independent uniform on (-1, 1), until s1 < 1
-        s1 = 1
-        while s1 >= 1.0:
-            e1, e2 = np.random.uniform(-1, 1, size=(2,))
-            s1 = e1**2 + e2**2
-
-        # Choose e3, e4 independent uniform on (-1, 1), until s2 < 1
-        s2 = 1
-        while s2 >= 1.0:
-            e3, e4 = np.random.uniform(-1, 1, size=(2,))
-            s2 = e3**2 + e4**2
-
-        # Then construct point on surface of 4-sphere
-        root = np.sqrt((1 - s1) / s2)
-        quat = np.array([e1, e2, e3 * root, e4 * root])
-
-        return quat
+        return cls.random_rotations(1)[0]
+
+    @classmethod
+    def random_rotations(cls, n):
+        """Return n random rotations, expressed as unit quaternions.
+
+        Vectorized form of random_rotation: candidate (e1, e2, e3, e4) are
+        drawn in blocks and the pairs falling outside the unit disc are
+        rejected together.
+
+        Args:
+            n (int): Number of rotations.
+
+        Returns:
+            np.ndarray[float]: A (n, 4) array of unit quaternions.
+        """
+        if n <= 0:
+            return np.empty((0, 4))
+
+        quats = []
+        nquats = 0
+        while nquats < n:
+            # Choose e1, e2, e3, e4 independent uniform on (-1, 1), keeping
+            # rows with s1 < 1 and s2 < 1
+            e = np.random.uniform(-1, 1, size=(max(2 * (n - nquats), 16), 4))
+            s1 = e[:, 0] ** 2 + e[:, 1] ** 2
+            s2 = e[:, 2] ** 2 + e[:, 3] ** 2
+            mask = (s1 < 1.0) & (s2 < 1.0)
+            e, s1, s2 = e[mask], s1[mask], s2[mask]
+
+            # Then construct points on surface of 4-sphere
+            root = np.sqrt((1 - s1) / s2)
+            e[:, 2] *= root
+            e[:, 3] *= root
+            quats.append(e[: n - nquats])
+            nquats += quats[-1].shape[0]
+        return np.concatenate(quats)
@@ -9,8 +9,11 @@ included as a specialized version of the mmCIF parser.
 """
 
 
+import io
 import re
+import sys
 import copy
+import functools
 import itertools
 
 ##
@@ -26,6 +29,40 @@ import itertools
 ## mmCIF Maximum Line Length
 MAX_LINE = 2048
 
+## buffer size for files opened by mmCIFFile.save_file
+WRITE_BUFFER_SIZE = 1 << 20
+
+## characters which prevent a value from being written as a plain token
+_RE_NON_TOKEN = re.compile(r"[\n \t#]")
+
+## mmCIF tokenizer; the index of the last matched group tells the kind of
+## token: 2 for _section.subsection, 3 for quoted strings, 4 for unquoted
+## tokens, and None for comments
+_RE_TOK = re.compile(
+    r"(?:"
+    r"(?:_(.+?)[.](\S+))"
+    "|"  # _section.subsection
+    r"(?:['\"](.*?)(?:['\"]\s|['\"]$))"
+    "|"  # quoted strings
+    r"(?:\s*#.*$)"
+    "|"  # comments
+    r"(\S+)"  # unquoted tokens
+    r")"
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _lc(name):
+    """Return the interned lower-case form of a column/table name. The set
+    of distinct names in a file is tiny, so the result is memoized, and
+    interning lets dict lookups keyed by it succeed on identity.
+    """
+    return sys.intern(name.lower())
+
+
+## sentinel for dict lookups where None is a valid default
+_MISSING = object()
+
 
 class mmCIFError(Exception):
     """Base class of errors raised by Structure objects."""
@@ -57,17 +94,16 @@ class mmCIFRow(dict):
         return id(self) == id(other)
 
     def __deepcopy__(self, memo):
-        cif_row = mmCIFRow()
-        for key, val in list(self.items()):
-            cif_row[key] = val
-        return cif_row
+        ## keys are already lower case and values are immutable strings,
+        ## so a plain dict copy is a deep copy
+        return mmCIFRow(self)
 
     def __contains__(self, column):
-        return dict.__contains__(self, column.lower())
+        return dict.__contains__(self, column) or dict.__contains__(self, _lc(column))
 
     def __setitem__(self, column, value):
         assert value is not None
-        dict.__setitem__(self, column.lower(), value)
+        dict.__setitem__(self, _lc(column), value)
 
     def __getattr__(self, name):
         try:
@@ -76,25 +112,36 @@ class mmCIFRow(dict):
             raise AttributeError(name)
 
     def __getitem__(self, column):
-        return dict.__getitem__(self, column.lower())
+        ## column names are almost always passed in lower case already,
+        ## so try the key as given before lower-casing it
+        try:
+            return dict.__getitem__(self, column)
+        except KeyError:
+            return dict.__getitem__(self, _lc(column))
 
     def getitem_lower(self, clower):
         return dict.__getitem__(self, clower)
 
     def __delitem__(self, column):
-        dict.__delitem__(self, column.lower())
+        try:
+            dict.__delitem__(self, column)
+        except KeyError:
+            dict.__delitem__(self, _lc(column))
 
     def get(self, column, default=None):
-        return dict.get(self, column.lower(), default)
+        x = dict.get(self, column, _MISSING)
+        if x is _MISSING:
+            return dict.get(self, _lc(column), default)
+        return x
 
     def get_lower(self, clower, default=None):
         return dict.get(self, clower, default)
 
     def has_key(self, column):
-        return dict.has_key(self, column.lower())
+        return dict.__contains__(self, _lc(column))
 
     def has_key_lower(self, clower):
-        return dict.has_key(self, clower)
+        return dict.__contains__(self, clower)
 
 
 class mmCIFTable(list):
@@ -102,23 +149,38 @@ class mmCIFTable(list):
     are stored as mmCIFRow classes.
     """
 
-    __slots__ = ["name", "columns", "columns_lower", "data"]
+    __slots__ = ["_name", "columns", "columns_lc", "columns_lower", "data"]
 
     def __init__(self, name, columns=None):
         assert name is not None
 
         list.__init__(self)
-        self.name = name
+        self._name = name
         if columns is None:
             self.columns = list()
+            self.columns_lc = list()
             self.columns_lower = dict()
         else:
             self.set_columns(columns)
 
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        ## the mmCIFData holding the table indexes it by name
+        self._name = name
+        try:
+            cif_data = object.__getattribute__(self, "data")
+        except AttributeError:
+            return
+        cif_data._reindex()
+
     def __deepcopy__(self, memo):
         table = mmCIFTable(self.name, self.columns[:])
         for row in self:
-            table.append(copy.deepcopy(row, memo))
+            table.append(mmCIFRow(row))
         return table
 
     def __eq__(self, other):
@@ -196,31 +258,36 @@ class mmCIFTable(list):
         columns.
         """
         self.columns = list()
+        self.columns_lc = list()
         self.columns_lower = dict()
         for column in columns:
             self.append_column(column)
 
     def append_column(self, column):
-        """Appends a column(subsection) name to the table."""
-        clower = column.lower()
+        """Appends a column(subsection) name to the table. The lower-case
+        form of the name is kept at the same index in columns_lc.
+        """
+        clower = _lc(column)
         if clower in self.columns_lower:
             i = self.columns.index(self.columns_lower[clower])
             self.columns[i] = column
             self.columns_lower[clower] = column
         else:
             self.columns.append(column)
+            self.columns_lc.append(clower)
             self.columns_lower[clower] = column
 
     def has_column(self, column):
         """Tests if the table contains the column name."""
-        return column.lower() in self.columns_lower
+        return _lc(column) in self.columns_lower
 
     def remove_column(self, column):
         """Removes the column name from the table."""
-        clower = column.lower()
+        clower = _lc(column)
         if clower not in self.columns_lower:
             return
         self.columns.remove(self.columns_lower[clower])
+        self.columns_lc.remove(clower)
         del self.columns_lower[clower]
 
     def autoset_columns(self):
@@ -239,10 +306,9 @@ class mmCIFTable(list):
 
     def get_row1(self, clower, value):
         """Return the first row which which has column data matching value."""
-        fpred = lambda r: r.get_lower(clower) == value
-        list(filter(fpred, self))
-        for row in filter(fpred, self):
-            return row
+        for row in self:
+            if dict.get(row, clower) == value:
+                return row
         return None
 
     def get_row(self, *args):
@@ -256,10 +322,12 @@ class mmCIFTable(list):
         """
         if len(args) == 1:
             clower, value = args[0]
+            clower = _lc(clower)
             for row in self:
                 if row.get_lower(clower) == value:
                     return row
         else:
+            args = [(_lc(clower), value) for clower, value in args]
             for row in self:
                 match_row = True
                 for clower, value in args:
@@ -280,6 +348,7 @@ class mmCIFTable(list):
         """This is the same as get_row, but it iterates over all matching
         rows in the table.
         """
+        args = [(_lc(clower), value) for clower, value in args]
         for cif_row in self:
             match_row = True
             for clower, value in args:
@@ -295,6 +364,7 @@ class mmCIFTable(list):
         the same key value, they will be overwritten with the last found
         row.
         """
+        clower = _lc(clower)
         dictx = dict()
         for row in self:
             try:
@@ -312,12 +382,28 @@ class mmCIFData(list):
     their subsections as "Columns". The data is stored in "Rows".
     """
 
-    __slots__ = ["name", "file"]
+    __slots__ = ["_name", "file", "_by_name"]
 
     def __init__(self, name):
         assert name is not None
         list.__init__(self)
-        self.name = name
+        self._name = name
+        ## lower-case table name -> mmCIFTable
+        self._by_name = dict()
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        ## the mmCIFFile holding the data block indexes it by name
+        self._name = name
+        try:
+            cif_file = object.__getattribute__(self, "file")
+        except AttributeError:
+            return
+        cif_file._reindex()
 
     def __str__(self):
         return "mmCIFData(name = %s)" % (self.name)
@@ -332,45 +418,90 @@ class mmCIFData(list):
         return id(self) == id(other)
 
     def __getattr__(self, name):
+        ## private names are never tables; this also keeps lookups of
+        ## _by_name from recursing before __init__ has set it
+        if name.startswith("_"):
+            raise AttributeError(name)
         try:
             return self[name]
         except KeyError:
             raise AttributeError(name)
 
+    def __reduce__(self):
+        """The tables are pickled as list items, so unpickling and
+        copy.copy() add them back through append(), which rebuilds the
+        name index.
+        """
+        try:
+            state = (None, {"file": object.__getattribute__(self, "file")})
+        except AttributeError:
+            state = None
+        return (self.__class__, (self.name,), state, iter(self))
+
     def __getitem__(self, x):
         if isinstance(x, int):
             return list.__getitem__(self, x)
 
         elif isinstance(x, str):
-            name = x.lower()
-            for ctable in self:
-                if ctable.name.lower() == name:
-                    return ctable
-            raise KeyError(x)
+            try:
+                return self._by_name[_lc(x)]
+            except KeyError:
+                raise KeyError(x)
 
         raise TypeError(x)
 
     def __setitem__(self, x, table):
         """ """
+        if isinstance(x, slice):
+            tables = list(table)
+            for table in list.__getitem__(self, x):
+                del table.data
+            for table in tables:
+                assert isinstance(table, mmCIFTable)
+                table.data = self
+            list.__setitem__(self, x, tables)
+            self._reindex()
+            return
+
         assert isinstance(table, mmCIFTable)
 
+        if isinstance(x, int):
+            ## replace the table in place; as with append() and insert(),
+            ## any other table of the same name is removed
+            x = range(len(self))[x]
+            old_table = list.__getitem__(self, x)
+            del old_table.data
+            table.data = self
+            list.__setitem__(self, x, table)
+            name = _lc(table.name)
+            for other in list(self):
+                if other is not table and _lc(other.name) == name:
+                    self.remove(other)
+            self._reindex()
+            return
+
         try:
             old_table = self[x]
-        except (KeyError, IndexError):
+        except KeyError:
             pass
         else:
             self.remove(old_table)
 
-        if isinstance(x, int):
-            table.data = self
-            list.__setitem__(self, x, table)
-
-        elif isinstance(x, str):
+        if isinstance(x, str):
             self.append(table)
 
     def __delitem__(self, x):
-        """Remove a mmCIFTable by index or table name."""
-        self.remove(self[x])
+        """Remove a mmCIFTable by index, slice or table name."""
+        if isinstance(x, slice):
+            self[x] = []
+        else:
+            self.remove(self[x])
+
+    def _reindex(self):
+        """Rebuild the name index from the list; the first table of a
+        name wins, as with a scan of the list.
+        """
+        self._by_name = {_lc(table.name): table for table in reversed(self)}
 
     def append(self, table):
         """Append a mmCIFTable. This will trigger the removal of any table
@@ -383,6 +514,7 @@ class mmCIFData(list):
             pass
         table.data = self
         list.append(self, table)
+        self._by_name[_lc(table.name)] = table
 
     def insert(self, i, table):
         assert isinstance(table, mmCIFTable)
@@ -392,11 +524,31 @@ class mmCIFData(list):
             pass
         table.data = self
         list.insert(self, i, table)
+        self._by_name[_lc(table.name)] = table
 
     def remove(self, table):
         assert isinstance(table, mmCIFTable)
         del table.data
         list.remove(self, table)
+        name = _lc(table.name)
+        if self._by_name.get(name) is table:
+            del self._by_name[name]
+
+    def pop(self, i=-1):
+        table = list.__getitem__(self, i)
+        self.remove(table)
+        return table
+
+    def extend(self, tables):
+        for table in tables:
+            self.append(table)
+
+    def __iadd__(self, tables):
+        self.extend(tables)
+        return self
+
+    def clear(self):
+        del self[:]
 
     def has_key(self, x):
         try:
@@ -441,7 +593,7 @@ class mmCIFData(list):
 
     def split_tag(self, tag):
         cif_table_name, cif_column_name = tag[1:].split(".")
-        return cif_table_name.lower(), cif_column_name.lower()
+        return _lc(cif_table_name), _lc(cif_column_name)
 
     def join_tag(self, cif_table_name, cif_column_name):
         return "_%s.%s" % (cif_table_name, cif_column_name)
@@ -472,6 +624,11 @@ class mmCIFSave(mmCIFData):
 class mmCIFFile(list):
     """Class representing a mmCIF files."""
 
+    def __init__(self):
+        list.__init__(self)
+        ## lower-case data name -> mmCIFData
+        self._by_name = dict()
+
     def __deepcopy__(self, memo):
         cif_file = mmCIFFile()
         for data in self:
@@ -486,31 +643,63 @@ class mmCIFFile(list):
         return id(self) == id(other)
 
     def __getattr__(self, name):
+        ## private names are never data blocks; this also keeps lookups
+        ## of _by_name from recursing before __init__ has set it
+        if name.startswith("_"):
+            raise AttributeError(name)
         try:
             return self[name]
         except KeyError:
             raise AttributeError(name)
 
+    def __reduce__(self):
+        """The data blocks are pickled as list items, so unpickling and
+        copy.copy() add them back through append(), which rebuilds the
+        name index.
+        """
+        state = {k: v for k, v in self.__dict__.items() if k != "_by_name"}
+        return (self.__class__, (), state or None, iter(self))
+
     def __getitem__(self, x):
         """Retrieve a mmCIFData object by index or name."""
         if isinstance(x, int):
             return list.__getitem__(self, x)
 
         elif isinstance(x, str):
-            name = x.lower()
-            for cdata in self:
-                if cdata.name.lower() == name:
-                    return cdata
-            raise KeyError(x)
+            try:
+                return self._by_name[_lc(x)]
+            except KeyError:
+                raise KeyError(x)
 
         raise TypeError(x)
 
+    def __setitem__(self, x, cdata):
+        """Replace mmCIFData objects by index or slice."""
+        if isinstance(x, slice):
+            cdata = list(cdata)
+            for c in cdata:
+                c.file = self
+        else:
+            cdata.file = self
+        list.__setitem__(self, x, cdata)
+        self._reindex()
+
     def __delitem__(self, x):
-        """Remove a mmCIFData by index or data name. Raises IndexError
-        or KeyError if the mmCIFData object is not found, the error raised
-        depends on the argument type.
+        """Remove a mmCIFData by index, slice or data name. Raises
+        IndexError or KeyError if the mmCIFData object is not found, the
+        error raised depends on the argument type.
+        """
+        if isinstance(x, slice):
+            list.__delitem__(self, x)
+            self._reindex()
+        else:
+            self.remove(self[x])
+
+    def _reindex(self):
+        """Rebuild the name index from the list; the first data block of
+        a name wins, as with a scan of the list.
         """
-        self.remove(self[x])
+        self._by_name = {_lc(cdata.name): cdata for cdata in reversed(self)}
 
     def append(self, cdata):
         """Append a mmCIFData object. This will trigger the removal of any
@@ -523,6 +712,7 @@ class mmCIFFile(list):
             pass
         cdata.file = self
         list.append(self, cdata)
+        self._by_name[_lc(cdata.name)] = cdata
 
     def insert(self, i, cdata):
         assert isinstance(cdata, mmCIFData)
@@ -532,6 +722,29 @@ class mmCIFFile(list):
             pass
         cdata.file = self
         list.insert(self, i, cdata)
+        self._by_name[_lc(cdata.name)] = cdata
+
+    def remove(self, cdata):
+        list.remove(self, cdata)
+        name = _lc(cdata.name)
+        if self._by_name.get(name) is cdata:
+            del self._by_name[name]
+
+    def pop(self, i=-1):
+        cdata = list.__getitem__(self, i)
+        self.remove(cdata)
+        return cdata
+
+    def extend(self, cdatas):
+        for cdata in cdatas:
+            self.append(cdata)
+
+    def __iadd__(self, cdatas):
+        self.extend(cdatas)
+        return self
+
+    def clear(self):
+        del self[:]
 
     def has_key(self, x):
         for cdata in self:
@@ -550,17 +763,21 @@ class mmCIFFile(list):
         The fil argument must be a file object or implement its iterface.
         """
         if isinstance(fil, str):
-            fileobj = open(fil, "r")
+            with open(fil, "r") as fileobj:
+                mmCIFFileParser().parse_file(fileobj, self)
         else:
-            fileobj = fil
-        mmCIFFileParser().parse_file(fileobj, self)
+            mmCIFFileParser().parse_file(fil, self)
 
     def save_file(self, fil):
+        """Write the mmCIF data in self to fil, which is either a path or a
+        file object. Files opened here get a large write buffer, as the
+        writer hands over its output in 64k chunks, and are closed again.
+        """
         if isinstance(fil, str):
-            fileobj = open(fil, "w")
+            with open(fil, "w", buffering=WRITE_BUFFER_SIZE) as fileobj:
+                mmCIFFileWriter().write_file(fileobj, self)
         else:
-            fileobj = fil
-        mmCIFFileWriter().write_file(fileobj, self)
+            mmCIFFileWriter().write_file(fil, self)
 
     def get_data(self, name):
         """Returns the mmCIFData object with the given name. Returns None
@@ -645,10 +862,14 @@ class mmCIFFileParser(object):
         cif_row = None
         state = ""
 
+        ## bound once; these are called for every token/row of the file
+        next_token = token_iter.__next__
+        islice = itertools.islice
+
         ## ignore anything in the input file until a reserved word is
         ## found
         while True:
-            tblx, colx, strx, tokx = next(token_iter)
+            tblx, colx, strx, tokx = next_token()
             if tokx is None:
                 continue
             rword, name = self.split_token(tokx)
@@ -720,7 +941,7 @@ class mmCIFFileParser(object):
 
                 ## get the next token from the file, it should be the data
                 ## keyed by the previous token
-                tx, cx, strx, tokx = next(token_iter)
+                tx, cx, strx, tokx = next_token()
                 if tx is not None or (strx is None and tokx is None):
                     self.syntax_error("missing data for _%s.%s" % (tblx, colx))
 
@@ -733,15 +954,15 @@ class mmCIFFileParser(object):
                         self.syntax_error("unexpected reserved word: %s" % (rword))
 
                     if tokx != ".":
-                        cif_row[colx] = tokx
+                        dict.__setitem__(cif_row, _lc(colx), tokx)
 
                 elif strx is not None:
-                    cif_row[colx] = strx
+                    dict.__setitem__(cif_row, _lc(colx), strx)
 
                 else:
                     self.syntax_error("bad token #4")
 
-                tblx, colx, strx, tokx = next(token_iter)
+                tblx, colx, strx, tokx = next_token()
                 continue
 
             ###
@@ -753,7 +974,7 @@ class mmCIFFileParser(object):
             elif state == "RD_LOOP":
                 ## the first section.subsection (tblx.colx) is read
                 ## to create the section(table) name for the entire loop
-                tblx, colx, strx, tokx = next(token_iter)
+                tblx, colx, strx, tokx = next_token()
 
                 if tblx is None or colx is None:
                     self.syntax_error("bad token #5")
@@ -775,7 +996,7 @@ class mmCIFFileParser(object):
 
                 ## read the remaining subsection definitions for the loop_
                 while True:
-                    tblx, colx, strx, tokx = next(token_iter)
+                    tblx, colx, strx, tokx = next_token()
 
                     if tblx is None:
                         break
@@ -796,27 +1017,37 @@ class mmCIFFileParser(object):
                         else:
                             self.syntax_error("unexpected reserved word: %s" % (rword))
 
-                ## now read all the data
+                ## now read all the data; the tokens of each row are taken
+                ## from the token stream in one islice() call and the row
+                ## is built from them in one pass. Unquoted "." tokens and
+                ## stray tags are left out of the row. The rows are known to
+                ## be mmCIFRow objects, so mmCIFTable.append is bypassed.
+                clowers = tuple(cif_table.columns_lc)
+                ncols = len(clowers)
                 while True:
-                    cif_row = mmCIFRow()
-                    cif_table.append(cif_row)
-
-                    for col in cif_table.columns:
-                        if tokx is not None:
-                            if tokx != ".":
-                                cif_row[col] = tokx
-                        elif strx is not None:
-                            cif_row[col] = strx
-
-                        tblx, colx, strx, tokx = next(token_iter)
+                    row_tokens = [(tblx, colx, strx, tokx)]
+                    row_tokens.extend(islice(token_iter, ncols - 1))
+                    cif_row = mmCIFRow(
+                        [
+                            (clower, s if t is None else t)
+                            for clower, (_, _, s, t) in zip(clowers, row_tokens)
+                            if (s is not None if t is None else t != ".")
+                        ]
+                    )
+                    cif_row.table = cif_table
+                    list.append(cif_table, cif_row)
+
+                    tblx, colx, strx, tokx = next_token()
 
                     ## the loop ends when one of these conditions is met:
                     ## condition #1: a new table is encountered
                     if tblx is not None:
                         break
 
-                    ## condition #2: a reserved word is encountered
-                    if tokx is not None:
+                    ## condition #2: a reserved word is encountered; all
+                    ## reserved words contain an underscore, which rules out
+                    ## nearly every data value without calling split_token
+                    if tokx is not None and "_" in tokx:
                         rword, name = self.split_token(tokx)
                         if rword is not None:
                             break
@@ -829,7 +1060,7 @@ class mmCIFFileParser(object):
                 cif_table_cache = dict()
                 cif_table = None
 
-                tblx, colx, strx, tokx = next(token_iter)
+                tblx, colx, strx, tokx = next_token()
 
             elif state == "RD_SAVE":
                 cif_data = mmCIFSave(tokx[5:])
@@ -837,26 +1068,21 @@ class mmCIFFileParser(object):
                 cif_table_cache = dict()
                 cif_table = None
 
-                tblx, colx, strx, tokx = next(token_iter)
+                tblx, colx, strx, tokx = next_token()
 
     def gen_token_iter(self, fileobj):
-        re_tok = re.compile(
-            r"(?:"
-            r"(?:_(.+?)[.](\S+))"
-            "|"  # _section.subsection
-            r"(?:['\"](.*?)(?:['\"]\s|['\"]$))"
-            "|"  # quoted strings
-            r"(?:\s*#.*$)"
-            "|"  # comments
-            r"(\S+)"  # unquoted tokens
-            r")"
-        )
+        """Returns an iterator over the tokens of the file. The tokenizer
+        works a line at a time, so the per-token iteration is left to
+        itertools.chain instead of resuming a generator for every token.
+        """
+        return itertools.chain.from_iterable(self.gen_line_tokens(fileobj))
 
+    def gen_line_tokens(self, fileobj):
+        """Yields a list of the tokens found on each line of the file."""
         file_iter = iter(fileobj)
 
-        ## parse file, yielding tokens for self.parser()
-        while True:
-            ln = next(file_iter)
+        ## parse file, yielding the tokens of each line for self.parser()
+        for ln in file_iter:
             self.line_number += 1
 
             ## skip comments
@@ -866,24 +1092,36 @@ class mmCIFFileParser(object):
             ## semi-colen multi-line strings
             if ln.startswith(";"):
                 lmerge = [ln[1:]]
-                while True:
-                    ln = next(file_iter)
+                for ln in file_iter:
                     self.line_number += 1
                     if ln.startswith(";"):
                         break
                     lmerge.append(ln)
+                else:
+                    ## unterminated multi-line string
+                    return
 
                 lmerge[-1] = lmerge[-1].rstrip()
-                yield (None, None, "".join(lmerge), None)
+                yield [(None, None, "".join(lmerge), None)]
                 continue
 
-            ## split line into tokens
-            tok_iter = re_tok.finditer(ln)
+            ## lines without tags, quotes or comments (the bulk of any
+            ## _loop data) are plain whitespace-separated tokens
+            if not ("_" in ln or "'" in ln or '"' in ln or "#" in ln):
+                yield [(None, None, None, tokx) for tokx in ln.split()]
+                continue
 
-            for tokm in tok_iter:
-                groups = tokm.groups()
-                if groups != (None, None, None, None):
-                    yield groups
+            ## split line into tokens
+            tokens = []
+            for tokm in _RE_TOK.finditer(ln):
+                i = tokm.lastindex
+                if i == 4:
+                    tokens.append((None, None, None, tokm.group(4)))
+                elif i == 3:
+                    tokens.append((None, None, tokm.group(3), None))
+                elif i == 2:
+                    tokens.append((tokm.group(1), tokm.group(2), None, None))
+            yield tokens
 
 
 class mmCIFFileWriter(object):
@@ -939,20 +1177,61 @@ class mmCIFFileWriter(object):
         if x == "" or x == ".":
             return ".", "token"
 
-        if x.find("\n") != -1:
+        ## plain tokens are by far the most common case; a single scan
+        ## rules out all of the special characters at once
+        if _RE_NON_TOKEN.search(x) is None:
+            if len(x) < MAX_LINE:
+                return x, "token"
+            else:
+                return x, "mstring"
+
+        if "\n" in x:
             return x, "mstring"
 
-        if x.count(" ") != 0 or x.count("\t") != 0 or x.count("#") != 0:
-            if len(x) > (MAX_LINE - 2):
-                return x, "mstring"
-            if x.count("' ") != 0 or x.count('" ') != 0:
-                return x, "mstring"
-            return x, "qstring"
+        if len(x) > (MAX_LINE - 2):
+            return x, "mstring"
+        if "' " in x or '" ' in x:
+            return x, "mstring"
+        return x, "qstring"
 
-        if len(x) < MAX_LINE:
-            return x, "token"
+    def data_type_batch(self, values):
+        """Analyze a column of values and return its type (token, qstring,
+        mstring) and the width needed to write it; missing values (None)
+        are written as '.'. Each distinct value is only analyzed once.
+        """
+        tokens = []
+        qstrings = []
+        has_mstring = False
+
+        ## values of different types may compare equal but format
+        ## differently (1 and 1.0), so the type is part of the key
+        for _, x0 in set(zip(map(type, values), values)):
+            if x0 is None:
+                tokens.append(".")
+                continue
+
+            x, dtype = self.data_type(x0)
+            if dtype == "token":
+                tokens.append(x)
+            elif dtype == "qstring":
+                qstrings.append(x)
+            else:
+                has_mstring = True
+
+        ## the column data type is the widest type found in it; the
+        ## width of qstring data includes the two quotes
+        if has_mstring:
+            dtype = "mstring"
+        elif qstrings:
+            dtype = "qstring"
         else:
-            return x, "mstring"
+            dtype = "token"
+
+        lenx = max(
+            max(map(len, tokens), default=0),
+            max(map(len, qstrings), default=-2) + 2,
+        )
+        return dtype, lenx
 
     def write_cif_data(self):
         if isinstance(self.cif_data, mmCIFSave):
@@ -995,13 +1274,15 @@ class mmCIFFileWriter(object):
         kmax += self.SPACING
         vmax = MAX_LINE - kmax - 1
 
-        ## write out the keys and values
-        for col in cif_table.columns:
-            cif_key = "_%s.%s" % (cif_table.name, col)
-            l = [cif_key.ljust(kmax)]
+        ## write out the keys and values; the whole table is collected
+        ## and written with a single call
+        prefix = "_" + cif_table.name + "."
+        l = []
+        for col, clower in zip(cif_table.columns, cif_table.columns_lc):
+            l.append((prefix + col).ljust(kmax))
 
             try:
-                x0 = row[col]
+                x0 = row.getitem_lower(clower)
             except KeyError:
                 x = "?"
                 dtype = "token"
@@ -1011,83 +1292,56 @@ class mmCIFFileWriter(object):
             if dtype == "token":
                 if len(x) > vmax:
                     l.append("\n")
-                l.append("%s\n" % (x))
-                self.write("".join(l))
+                l.append(x + "\n")
 
             elif dtype == "qstring":
                 if len(x) > vmax:
                     l.append("\n")
-                    self.write("".join(l))
-                    self.write_mstring(x)
+                    l.append(self.form_mstring(x))
 
                 else:
                     l.append("'%s'\n" % (x))
-                    self.write("".join(l))
 
             elif dtype == "mstring":
                 l.append("\n")
-                self.write("".join(l))
-                self.write_mstring(x)
+                l.append(self.form_mstring(x))
+
+        self.write("".join(l))
 
     def write_multi_row_table(self, cif_table):
+        ## snapshot the (name, lower-case name) column pairs once for the
+        ## passes below; the per-row write list is frozen the same way
+        columns = tuple(zip(cif_table.columns, cif_table.columns_lc))
+
         ## write the key description for the loop_
-        self.writeln("loop_")
-        for col in cif_table.columns:
-            key = "_%s.%s" % (cif_table.name, col)
+        prefix = "_" + cif_table.name + "."
+        l = ["loop_\n"]
+        for col, clower in columns:
+            key = prefix + col
             assert len(key) < MAX_LINE
-            self.writeln(key)
+            l.append(key + "\n")
+        self.write("".join(l))
 
+        ## scan the table one column at a time, classifying the column's
+        ## values together
         col_len_map = {}
         col_dtype_map = {}
 
-        for row in cif_table:
-            for col in cif_table.columns:
-                ## get data and data type
-                try:
-                    x0 = row[col]
-                except KeyError:
-                    lenx = 1
-                    dtype = "token"
-                else:
-                    x, dtype = self.data_type(x0)
-
-                    ## determine write length of data
-                    if dtype == "token":
-                        lenx = len(x)
-                    elif dtype == "qstring":
-                        lenx = len(x) + 2
-                    else:
-                        lenx = 0
-
-                try:
-                    col_dtype = col_dtype_map[col]
-                except KeyError:
-                    col_dtype_map[col] = dtype
-                    col_len_map[col] = lenx
-                    continue
-
-                ## update the column charactor width if necessary
-                if col_len_map[col] < lenx:
-                    col_len_map[col] = lenx
-
-                ## modify column data type if necessary
-                if col_dtype != dtype:
-                    if dtype == "mstring":
-                        col_dtype_map[col] = "mstring"
-                    elif col_dtype == "token" and dtype == "qstring":
-                        col_dtype_map[col] = "qstring"
+        for col, clower in columns:
+            values = [dict.get(row, clower) for row in cif_table]
+            col_dtype_map[col], col_len_map[col] = self.data_type_batch(values)
 
         ## form a write list of the column names with values of None to
         ## indicate a newline
         wlist = []
         llen = 0
-        for col in cif_table.columns:
+        for col, clower in columns:
             dtype = col_dtype_map[col]
 
             if dtype == "mstring":
                 llen = 0
                 wlist.append((None, None, None))
-                wlist.append((col, dtype, None))
+                wlist.append((clower, dtype, None))
                 continue
 
             lenx = col_len_map[col]
@@ -1100,60 +1354,83 @@ class mmCIFFileWriter(object):
                 wlist.append((None, None, None))
                 llen = lenx
 
-            wlist.append((col, dtype, lenx))
+            wlist.append((clower, dtype, lenx))
 
-        ## write out the data
+        ## the data type, width and leading space of every cell are fixed
+        ## by its place in the write list, so compile the write list into
+        ## one formatting function per cell
         spacing = " " * self.SPACING
+        form_mstring = self.form_mstring
+        get = dict.get
+
+        def format_token(clower, lead, lenx):
+            def fmt(row):
+                return lead + (str(get(row, clower, ".")) or ".").ljust(lenx)
+
+            return fmt
+
+        def format_qstring(clower, lead, lenx):
+            def fmt(row):
+                x = get(row, clower, ".")
+                if x == "":
+                    x = "."
+                elif x != "." and x != "?":
+                    x = "'%s'" % (x)
+                return lead + x.ljust(lenx)
+
+            return fmt
+
+        def format_mstring(clower):
+            def fmt(row):
+                try:
+                    x = dict.__getitem__(row, clower)
+                except KeyError:
+                    return ".\n"
+                return form_mstring(str(x))
+
+            return fmt
+
+        def format_newline(row):
+            return "\n"
+
+        fmts = []
         add_space = False
-        listx = []
+        for clower, dtype, lenx in wlist:
+            if clower is None:
+                fmts.append(format_newline)
+                add_space = False
+                continue
 
-        for row in cif_table:
-            for col, dtype, lenx in wlist:
-                if col is None:
-                    add_space = False
-                    listx.append("\n")
-                    continue
-
-                if add_space == True:
-                    add_space = False
-                    listx.append(spacing)
-
-                if dtype == "token":
-                    x = str(row.get(col, "."))
-                    if x == "":
-                        x = "."
-                    x = x.ljust(lenx)
-                    listx.append(x)
-                    add_space = True
-
-                elif dtype == "qstring":
-                    x = row.get(col, ".")
-                    if x == "":
-                        x = "."
-                    elif x != "." and x != "?":
-                        x = "'%s'" % (x)
-                    x = x.ljust(lenx)
-                    listx.append(x)
-                    add_space = True
-
-                elif dtype == "mstring":
-                    try:
-                        listx.append(self.form_mstring(row[col]))
-                    except KeyError:
-                        listx.append(".\n")
-                    add_space = False
+            lead = spacing if add_space else ""
+            if dtype == "token":
+                fmts.append(format_token(clower, lead, lenx))
+                add_space = True
+            elif dtype == "qstring":
+                fmts.append(format_qstring(clower, lead, lenx))
+                add_space = True
+            elif dtype == "mstring":
+                fmts.append(format_mstring(clower))
+                add_space = False
+        fmts = tuple(fmts)
+
+        ## write out the data
+        buf = io.StringIO()
+        write = buf.write
 
-            add_space = False
-            listx.append("\n")
+        for row in cif_table:
+            for fmt in fmts:
+                write(fmt(row))
+            write("\n")
 
-            ## write out strx if it gets big to avoid using a lot of
-            ## memory
-            if len(listx) > 1024:
-                self.write("".join(listx))
-                listx = []
+            ## write out the buffer if it gets big to avoid using a lot
+            ## of memory
+            if buf.tell() > 65536:
+                self.write(buf.getvalue())
+                buf = io.StringIO()
+                write = buf.write
 
         ## write out the _loop section
-        self.write("".join(listx))
+        self.write(buf.getvalue())
 
 
 ### <testing>
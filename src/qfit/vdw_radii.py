@@ -1,3 +1,8 @@
+import sys
+from types import MappingProxyType
+
+import numpy as np
+
 # ElementList=[
 #   " H", "HE",
 #   "LI", "BE", " B", " C", " N", " O", " F", "NE",
@@ -206,3 +211,58 @@ EpsilonArray = [
     [0.063, 0.173, 0.179, 0.200, 0.200],  # O
     [0.063, 0.173, 0.179, 0.200, 0.200],
 ]  # S
+
+# EpsilonArray as an array, with the row/column of each element in
+# EPSILON_INDEX_MAP.
+EPSILON_MATRIX = np.asarray(EpsilonArray, dtype=np.float64)
+EPSILON_INDEX_MAP = {e: i for i, e in enumerate(EpsilonIndex)}
+
+
+def epsilon_indices(elements):
+    """Map elements to their EPSILON_MATRIX rows. Raises ValueError for an
+    element without epsilons, as EpsilonIndex.index does.
+    """
+    try:
+        return np.array([EPSILON_INDEX_MAP[e] for e in elements], dtype=np.intp)
+    except KeyError as e:
+        raise ValueError(f"{e.args[0]!r} is not in EpsilonIndex") from None
+
+
+def epsilon_arrays(index1, index2):
+    """Gather epsilons for arrays of EPSILON_INDEX_MAP indices."""
+    return EPSILON_MATRIX[index1, index2]
+
+
+# A dense version of vdwRadiiTable, indexed by atomic number, so that the
+# radii of a whole atom array can be gathered in one step, e.g.
+# VDW_RADII_BY_Z[element_to_Z(atoms.e)]. Index 0 holds the radius used for
+# unknown elements. D and AN have no atomic number of their own and are
+# given the slots after UO.
+# vdwRadiiTable lists H through UB in order of atomic number.
+_SYMBOL_TO_Z = {e: z for z, e in enumerate(list(vdwRadiiTable)[:112], start=1)}
+_SYMBOL_TO_Z.update({"UQ": 114, "UH": 116, "UO": 118, "D": 119, "AN": 120})
+
+VDW_RADII_BY_Z = np.full(121, 1.8, dtype=np.float64)
+for _e, _z in _SYMBOL_TO_Z.items():
+    VDW_RADII_BY_Z[_z] = vdwRadiiTable[_e]
+del _e, _z
+
+
+def element_to_Z(elements):
+    """Map element symbols to atomic numbers, with 0 for unknown elements."""
+    return np.array([_SYMBOL_TO_Z.get(e.upper(), 0) for e in elements], dtype=np.intp)
+
+
+# The tables are read-only; expose them as mapping proxies with interned
+# keys. Lookups expect upper-case element symbols.
+vdwRadiiTable = MappingProxyType(
+    {sys.intern(e): radius for e, radius in vdwRadiiTable.items()}
+)
+EpsilonTable = MappingProxyType(
+    {
+        sys.intern(e1): MappingProxyType(
+            {sys.intern(e2): epsilon for e2, epsilon in row.items()}
+        )
+        for e1, row in EpsilonTable.items()
+    }
+)
@@ -28,12 +28,22 @@ def setup_module(module):
         cleanup_on_sigterm()
 
 
+# (space group, model); residues 60 and 61 of each model are run through qfit
+SPACE_GROUP_MODELS = [
+    ("C2221", "1dmm"),  # Gly, Leu
+    ("I212121", "2apb"),  # Ile, Pro
+    ("I422", "5gge"),  # Ser, Ala
+    ("P4212", "3sb3"),  # Lys, Ser
+]
+
+
+@pytest.mark.parametrize("space_group,pdb_id", SPACE_GROUP_MODELS)
 class TestQFitProtein:
-    def mock_main(self):
+    def mock_main(self, pdb_id):
         # Prepare args
         args = [
-            "./tests/space_group_test/1dmm_map.mtz",  # mapfile, using relative directory from tests/
-            "./tests/space_group_test/1dmm.pdb",  # structurefile, using relative directory from tests/
+            f"./tests/space_group_test/{pdb_id}_map.mtz",  # mapfile, using relative directory from tests/
+            f"./tests/space_group_test/{pdb_id}.pdb",  # structurefile, using relative directory from tests/
             "-l",
             "FP,SIGFP",
         ]
@@ -76,11 +86,11 @@ class TestQFitProtein:
 
         return qfit
 
-    def test_run_qfit_residue_parallel(self):
-        qfit = self.mock_main()
+    def test_run_qfit_residue_parallel(self, space_group, pdb_id):
+        qfit = self.mock_main(pdb_id)
 
         # Run qfit object
         multiconformer = qfit._run_qfit_residue_parallel()
         mconformer_list = list(multiconformer.residues)
         print(mconformer_list)  # If we fail, this gets printed.
-        print(len(mconformer_list))  # Expect: 2 residues ie 60 is Gly and 61 is Leu
+        print(len(mconformer_list))  # Expect: 2 residues
@@ -0,0 +1,228 @@
+import copy
+import io
+import os
+import pickle
+
+import pytest
+
+from qfit.structure.mmCIF import MAX_LINE, mmCIFData, mmCIFFile, mmCIFTable
+
+
+CIF_FILE = os.path.join(os.path.dirname(__file__), "qfit_io_test", "7o9m.cif")
+
+EDGE_CASES = """data_edge
+_single.quoted 'a b'
+_single.dquoted "it's"
+_single.unknown ?
+_single.empty .
+_single.text
+;line one
+line two
+;
+loop_
+_multi.id
+_multi.value
+_multi.note
+1 'x y' ?
+2 plain .
+3
+;first
+second
+;
+"q"
+"""
+
+
+def parse(text):
+    cif = mmCIFFile()
+    cif.load_file(io.StringIO(text))
+    return cif
+
+
+def write(cif):
+    fileobj = io.StringIO()
+    cif.save_file(fileobj)
+    return fileobj.getvalue()
+
+
+def table_rows(cif):
+    return [
+        (cif_data.name, cif_table.name, cif_table.columns, [dict(r) for r in cif_table])
+        for cif_data in cif
+        for cif_table in cif_data
+    ]
+
+
+def fold(value, width=MAX_LINE - 2):
+    lines = []
+    for line in value.split("\n"):
+        lines.extend(line[i : i + width] for i in range(0, max(len(line), 1), width))
+    return "\n".join(lines)
+
+
+def written_rows(cif):
+    # The rows as they read back after writing: values missing from
+    # single-row tables are written as "?", and overlong lines are folded
+    rows = table_rows(cif)
+    for data_name, table_name, columns, table in rows:
+        for row in table:
+            for key, value in row.items():
+                if len(value) > MAX_LINE - 2:
+                    row[key] = fold(value)
+        if len(table) == 1:
+            for col in columns:
+                table[0].setdefault(col.lower(), "?")
+    return rows
+
+
+@pytest.fixture(scope="module")
+def cif_7o9m():
+    cif = mmCIFFile()
+    cif.load_file(CIF_FILE)
+    return cif
+
+
+def test_load_7o9m(cif_7o9m):
+    assert len(cif_7o9m) == 1
+    assert cif_7o9m[0].name == "7O9M"
+    atom_site = cif_7o9m[0]["atom_site"]
+    assert len(atom_site) > 0
+    assert atom_site[0]["group_PDB"] == "ATOM"
+
+
+def test_roundtrip_7o9m(cif_7o9m):
+    output = write(cif_7o9m)
+    reparsed = parse(output)
+    assert table_rows(reparsed) == written_rows(cif_7o9m)
+    assert write(reparsed) == output
+
+
+def test_parse_edge_cases():
+    cif = parse(EDGE_CASES)
+    single = cif["edge"]["single"]
+    assert single.columns == ["quoted", "dquoted", "unknown", "empty", "text"]
+    assert dict(single[0]) == {
+        "quoted": "a b",
+        "dquoted": "it's",
+        "unknown": "?",
+        "text": "line one\nline two",
+    }
+    multi = cif["edge"]["multi"]
+    assert [dict(row) for row in multi] == [
+        {"id": "1", "value": "x y", "note": "?"},
+        {"id": "2", "value": "plain"},
+        {"id": "3", "value": "first\nsecond", "note": "q"},
+    ]
+
+
+def test_roundtrip_edge_cases():
+    cif = parse(EDGE_CASES)
+    output = write(cif)
+    reparsed = parse(output)
+    assert table_rows(reparsed) == written_rows(cif)
+    assert write(reparsed) == output
+
+
+def test_parse_quoted_dot():
+    # A quoted "." is a value; only the bare "." token means "not applicable"
+    cif = parse("data_t\nloop_\n_a.x\n_a.y\n'.' b\n. \".\"\n")
+    assert [dict(row) for row in cif["t"]["a"]] == [
+        {"x": ".", "y": "b"},
+        {"y": "."},
+    ]
+
+
+def test_pickle_and_copy(cif_7o9m):
+    output = write(cif_7o9m)
+    unpickled = pickle.loads(pickle.dumps(cif_7o9m))
+    assert write(unpickled) == output
+    assert unpickled["7o9m"].atom_site is unpickled[0]["atom_site"]
+    cif_data = pickle.loads(pickle.dumps(cif_7o9m[0]))
+    assert copy.copy(cif_data).has_key("atom_site")
+
+
+def test_name_index_follows_list_changes():
+    cif = parse(EDGE_CASES)
+    cif_data = cif[0]
+    multi = cif_data.pop()
+    assert not cif_data.has_key("multi")
+    cif_data.extend([multi])
+    assert cif_data["multi"] is multi
+    del cif_data[:1]
+    assert not cif_data.has_key("single")
+    cif_data[:] = []
+    assert cif_data.get("multi") is None
+    cif.clear()
+    assert cif.get_data("edge") is None
+
+
+def test_write_mixed_qstring_column():
+    # A loop column holding a value that needs quoting is written as a
+    # qstring column; the non-str values in it are quoted too
+    cif = parse("data_t\nloop_\n_a.x\n_a.y\n1 p\n2 q\n")
+    rows = cif["t"]["a"]
+    rows[0]["x"] = 5
+    rows[1]["x"] = "a b"
+    output = write(cif)
+    assert "'5'" in output
+    reparsed = parse(output)
+    assert [dict(row) for row in reparsed["t"]["a"]] == [
+        {"x": "5", "y": "p"},
+        {"x": "a b", "y": "q"},
+    ]
+    assert write(reparsed) == output
+
+
+def test_write_mixed_loop_cells():
+    # Every per-cell formatter of a loop_ table accepts non-str values
+    # and missing cells
+    cif = parse("data_t\nloop_\n_a.x\n_a.y\n_a.z\n1 p r\n2 q s\n3 t u\n")
+    rows = cif["t"]["a"]
+    rows[0]["x"] = 5
+    rows[0]["y"] = 1.5
+    rows[0]["z"] = "two\nlines"
+    rows[1]["x"] = "a b"
+    rows[1]["z"] = 7
+    del rows[2]["x"]
+    del rows[2]["z"]
+    output = write(cif)
+    reparsed = parse(output)
+    assert [dict(row) for row in reparsed["t"]["a"]] == [
+        {"x": "5", "y": "1.5", "z": "two\nlines"},
+        {"x": "a b", "y": "q", "z": "7"},
+        {"y": "t"},
+    ]
+    assert write(reparsed) == output
+
+
+def test_setitem_negative_index():
+    cif_data = mmCIFData("t")
+    for name in "abc":
+        cif_data.new_table(name)
+    z = mmCIFTable("z")
+    cif_data[-1] = z
+    assert [table.name for table in cif_data] == ["a", "b", "z"]
+    assert cif_data["z"] is z
+    assert not cif_data.has_key("c")
+    cif_data[-3] = mmCIFTable("b")
+    assert [table.name for table in cif_data] == ["b", "z"]
+
+    cif = mmCIFFile()
+    cif.append(mmCIFData("x"))
+    cif.append(mmCIFData("y"))
+    cif[-1] = mmCIFData("w")
+    assert [cdata.name for cdata in cif] == ["x", "w"]
+    assert cif.get_data("y") is None
+
+
+def test_rename():
+    cif = parse(EDGE_CASES)
+    cif_data = cif["edge"]
+    multi = cif_data["multi"]
+    multi.name = "Q"
+    assert cif_data["q"] is multi
+    assert not cif_data.has_key("multi")
+    cif_data.name = "renamed"
+    assert cif["renamed"] is cif_data
+    assert cif.get_data("edge") is None
+    assert "_Q.id" in write(cif)
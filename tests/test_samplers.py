@@ -0,0 +1,137 @@
+import os
+
+import numpy as np
+import pytest
+
+from qfit.samplers import (
+    BackboneRotator,
+    RotationSets,
+    _find_neighbours,
+    _zaxis_align,
+    _zaxis_align_batch,
+)
+from qfit.structure import Structure
+from qfit.structure.math import Ry, Rz
+
+
+PDB_FILE = os.path.join(
+    os.path.dirname(__file__), "basic_qfit_protein_test", "1G8A_refined.pdb"
+)
+
+
+def _reference_zaxis_align(axis):
+    # The ZAxisAligner formulas the vectorized versions replace
+    axis = axis / np.linalg.norm(axis[:-1])
+    xaxis_angle = np.arccos(axis[0])
+    if axis[1] < 0:
+        xaxis_angle *= -1
+    rz = Rz(xaxis_angle)
+    axis = np.dot(rz.T, axis.reshape(3, -1)).ravel()
+    zaxis_angle = np.arccos(axis[2] / np.linalg.norm(axis))
+    if axis[0] < 0:
+        zaxis_angle *= -1
+    ry = Ry(zaxis_angle)
+    return rz @ ry, ry.T @ rz.T
+
+
+def _reference_find_neighbours(conn, root, curr):
+    # The recursive walk the CSR traversal replaces
+    atoms = [root]
+    foundroot = 0
+
+    def visit(curr):
+        nonlocal foundroot
+        atoms.append(curr)
+        for b in np.flatnonzero(conn[curr]):
+            if b == root:
+                foundroot += 1
+            if b not in atoms:
+                visit(b)
+
+    visit(curr)
+    return atoms, foundroot
+
+
+@pytest.mark.parametrize("n", [0, 1, 7, 1000])
+def test_random_rotations(n):
+    quats = RotationSets.random_rotations(n)
+    assert quats.shape == (n, 4)
+    assert np.allclose(np.linalg.norm(quats, axis=1), 1)
+
+
+@pytest.mark.parametrize("max_angle, nrots", [(10, 10), (10, 100), (90, 50)])
+def test_local(max_angle, nrots):
+    quats = RotationSets.local(max_angle, nrots=nrots)
+    assert quats.shape == (nrots, 4)
+    assert np.array_equal(quats[-1], [1, 0, 0, 0])
+    angles = 2 * np.arccos(np.clip(quats[:, 0], -1, 1))
+    assert np.all(angles <= np.deg2rad(max_angle))
+
+
+def test_zaxis_align():
+    rng = np.random.default_rng(0)
+    axes = rng.normal(size=(50, 3))
+    forward, backward = _zaxis_align_batch(axes)
+    for axis, f, b in zip(axes, forward, backward):
+        f_ref, b_ref = _reference_zaxis_align(axis)
+        assert np.allclose(f, f_ref, rtol=0, atol=1e-12)
+        assert np.allclose(b, b_ref, rtol=0, atol=1e-12)
+        f, b = _zaxis_align(axis)
+        assert np.allclose(f, f_ref, rtol=0, atol=1e-12)
+        assert np.allclose(b, b_ref, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_find_neighbours(seed):
+    rng = np.random.default_rng(seed)
+    conn = rng.random((30, 30)) < 0.08
+    conn = conn | conn.T
+    np.fill_diagonal(conn, False)
+    for root, curr in zip(*np.nonzero(conn)):
+        atoms, foundroot = _find_neighbours(conn, root, curr)
+        atoms_ref, foundroot_ref = _reference_find_neighbours(conn, root, curr)
+        assert atoms.tolist() == atoms_ref
+        assert foundroot == foundroot_ref
+
+
+def test_backbone_rotator():
+    structure = Structure.fromfile(PDB_FILE)
+    segment = next(iter(structure.segments))[5:9]
+    starting_coor = segment.coor
+    torsions = np.random.default_rng(0).uniform(-20, 20, size=2 * len(segment))
+    torsions[3] = 0
+
+    # The per-torsion loop of the original BackboneRotator; the selections
+    # index the coordinates of the whole structure
+    xyz = segment._coor.copy()
+    moved = np.array([], dtype=np.int32)
+    atoms_to_rotate = []
+    rotations = []
+    for n, residue in enumerate(segment.residues[::-1]):
+        psi_sel = residue.select("name", ("O", "OXT"))
+        if n > 0:
+            psi_sel = np.concatenate((psi_sel, segment.residues[-n]._selection))
+        phi_sel = residue.select("name", ("N", "CA", "O", "OXT", "H", "HA"), "!=")
+        N = residue.extract("name", "N").coor[0]
+        CA = residue.extract("name", "CA").coor[0]
+        C = residue.extract("name", "C").coor[0]
+        for selection, axis, origin in ((psi_sel, C - CA, C), (phi_sel, CA - N, CA)):
+            moved = np.unique(np.concatenate((moved, selection)).astype(np.int32))
+            atoms_to_rotate.append(moved)
+            rotations.append((_reference_zaxis_align(axis), origin))
+    for torsion, atoms, ((f, b), origin) in zip(
+        np.deg2rad(torsions[::-1]), atoms_to_rotate, rotations
+    ):
+        if torsion == 0.0:
+            continue
+        R = f @ Rz(torsion) @ b
+        xyz[atoms] = np.dot(xyz[atoms] - origin, R.T) + origin
+
+    rotator = BackboneRotator(segment)
+    rotator(torsions)
+    assert np.allclose(segment._coor, xyz, rtol=0, atol=1e-12)
+    assert not np.allclose(segment.coor, starting_coor)
+
+    # The rotator always starts again from the starting coordinates
+    rotator(np.zeros_like(torsions))
+    assert np.allclose(segment.coor, starting_coor, rtol=0, atol=1e-12)
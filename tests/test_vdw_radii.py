@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from qfit.vdw_radii import (
+    EpsilonTable,
+    VDW_RADII_BY_Z,
+    element_to_Z,
+    epsilon_arrays,
+    epsilon_indices,
+    vdwRadiiTable,
+)
+
+
+def test_vdw_radii_by_z():
+    radii = VDW_RADII_BY_Z[element_to_Z(list(vdwRadiiTable))]
+    assert np.array_equal(radii, list(vdwRadiiTable.values()))
+    assert VDW_RADII_BY_Z[element_to_Z(["XX"])][0] == 1.8
+
+
+def test_epsilon_arrays():
+    elements = list(EpsilonTable)
+    index = epsilon_indices(elements)
+    epsilons = epsilon_arrays(index[:, np.newaxis], index[np.newaxis, :])
+    expected = [[EpsilonTable[e1][e2] for e2 in elements] for e1 in elements]
+    assert np.array_equal(epsilons, expected)
+    with pytest.raises(ValueError):
+        epsilon_indices(["C", "SE"])